@@ -1,4 +1,5 @@
 import socket
+from contextlib import asynccontextmanager
 
 import uvicorn
 from fastapi import FastAPI
@@ -6,17 +7,32 @@ from fastapi.middleware.cors import CORSMiddleware
 from src.api.v1.router import api_router
 from src.core.config import get_settings
 from src.db.mongodb import connect_to_mongodb, close_mongodb_connection
+from src.db.init_db import init_db
+from src.services.download_service import start_download_writer, stop_download_writer
 
 from src.core.logging import logger
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize connections and background workers for the app's lifetime."""
+    await connect_to_mongodb()
+    await init_db()
+    start_download_writer()
+    yield
+    await stop_download_writer()
+    await close_mongodb_connection()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.APP_VERSION,
     docs_url=f"{settings.API_PREFIX}/docs",
     redoc_url=f"{settings.API_PREFIX}/redoc",
     openapi_url=f"{settings.API_PREFIX}/openapi.json",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware with comprehensive origins support
@@ -33,25 +49,18 @@ app.add_middleware(
         "http://127.0.0.1:3000",
     ],
     allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
+    # Only the methods the API actually serves; preflights for anything
+    # else should be rejected
+    allow_methods=["GET", "POST", "DELETE"],
     allow_headers=["*"],
     expose_headers=["Content-Disposition"],  # Important for downloads
+    max_age=86400,  # Let browsers cache preflight responses for a day
 )
 
 # Include API router
 app.include_router(api_router, prefix=settings.API_PREFIX)
 
 
-@app.on_event("startup")
-async def startup_event():
-    await connect_to_mongodb()
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    await close_mongodb_connection()
-
-
 @app.get("/")
 async def root():
     return {
@@ -88,7 +97,7 @@ if __name__ == "__main__":
             loop="auto"  # Changed from "asyncio" to "auto"
         )
     except Exception as e:
-        logger.error(f"Server error: {e}")
+        logger.error("Server error: %s", e)
         # Force cleanup of any remaining sockets
         import gc
 
@@ -1,22 +1,38 @@
-from typing import Generator
+from functools import lru_cache
 
-from fastapi import Depends
+from bson import ObjectId
 
+from src.core.exceptions import InvalidImageIdException
 from src.services.image_service import ImageService
 from src.services.download_service import DownloadService
 from src.services.storage_service import StorageService
+from src.utils.object_id import is_valid_object_id
 
 
+def parse_image_id(image_id: str) -> ObjectId:
+    """Dependency that parses the image_id path parameter into an ObjectId.
+
+    Converting once here lets every service method on the request share the
+    parsed value instead of each re-parsing the hex string.
+    """
+    if not is_valid_object_id(image_id):
+        raise InvalidImageIdException()
+    return ObjectId(image_id)
+
+
+@lru_cache()
 def get_image_service() -> ImageService:
-    """Dependency to get image service."""
+    """Dependency to get the shared image service instance."""
     return ImageService()
 
 
+@lru_cache()
 def get_download_service() -> DownloadService:
-    """Dependency to get download service."""
+    """Dependency to get the shared download service instance."""
     return DownloadService()
 
 
+@lru_cache()
 def get_storage_service() -> StorageService:
-    """Dependency to get storage service."""
-    return StorageService()
\ No newline at end of file
+    """Dependency to get the shared storage service instance."""
+    return StorageService()
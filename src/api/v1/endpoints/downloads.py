@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Depends, Request
+from bson import ObjectId
+from fastapi import APIRouter, BackgroundTasks, Depends, Request
 
-from src.api.deps import get_download_service, get_image_service
+from src.api.deps import get_download_service, get_image_service, parse_image_id
 from src.schemas.download import DownloadResponse, DownloadCountResponse
 from src.services.download_service import DownloadService
 from src.services.image_service import ImageService
@@ -11,30 +12,34 @@ router = APIRouter()
 
 @router.post("/{image_id}", response_model=DownloadResponse)
 async def download_image(
-        image_id: str,
         request: Request,
-        download_service: DownloadService = Depends(get_download_service),
-        image_service: ImageService = Depends(get_image_service)
+        background_tasks: BackgroundTasks,
+        image_id: ObjectId = Depends(parse_image_id),
+        download_service: DownloadService = Depends(get_download_service)
 ):
     """Record a download and return the download URL."""
-    logger.info(f"Processing download for image {image_id}")
+    logger.info("Processing download for image %s", image_id)
 
-    # Check if image exists
-    image = await image_service.get_image(image_id)
+    # One indexed _id operation checks existence, bumps the download
+    # counter and returns the URL (404s on unknown ids)
+    download_url = await download_service.start_download(image_id)
 
-    # Extract request information
+    # Extract request information; bind the headers mapping once instead
+    # of resolving the property per lookup
+    headers = request.headers
     request_info = {
         "ip_address": request.client.host,
-        "user_agent": request.headers.get("user-agent", "unknown"),
-        "referer": request.headers.get("referer"),
+        "user_agent": headers.get("user-agent", "unknown"),
+        "referer": headers.get("referer"),
         # Country code would be determined by IP geolocation in production
     }
 
-    # Record the download
-    await download_service.record_download(image_id, request_info)
+    # Record the download after the response is sent; the client does not
+    # need to wait for the Mongo writes before starting the download.
+    background_tasks.add_task(download_service.record_download, image_id, request_info)
 
     # Return download URL
-    return {"download_url": image.hd_url}
+    return {"download_url": download_url}
 
 
 @router.get("/total", response_model=DownloadCountResponse)
@@ -49,12 +54,12 @@ async def get_total_downloads(
 
 @router.get("/{image_id}/count", response_model=DownloadCountResponse)
 async def get_image_downloads(
-        image_id: str,
+        image_id: ObjectId = Depends(parse_image_id),
         download_service: DownloadService = Depends(get_download_service),
         image_service: ImageService = Depends(get_image_service)
 ):
     """Get download count for a specific image."""
-    logger.info(f"Getting download count for image {image_id}")
+    logger.info("Getting download count for image %s", image_id)
 
     # Check if image exists
     await image_service.get_image(image_id)
@@ -1,8 +1,10 @@
+import hashlib
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, File, Form, UploadFile, status
+from bson import ObjectId
+from fastapi import APIRouter, Depends, File, Form, Request, Response, UploadFile, status
 
-from src.api.deps import get_image_service
+from src.api.deps import get_image_service, parse_image_id
 from src.schemas.image import ImageCreate, ImageUpdate, ImageResponse, ImagesResponse
 from src.services.image_service import ImageService
 from src.core.logging import logger
@@ -19,20 +21,31 @@ async def get_images(
         image_service: ImageService = Depends(get_image_service)
 ):
     """Get a list of images with optional filtering."""
-    logger.info(f"Getting images with skip={skip}, limit={limit}, tags={tags}, featured={featured}")
-    images = await image_service.get_images(skip, limit, tags, featured)
-    total_count = await image_service.count_images(tags, featured)
-    return {"images": images, "total": total_count}
+    logger.info("Getting images with skip=%s, limit=%s, tags=%s, featured=%s", skip, limit, tags, featured)
+    images, has_more = await image_service.get_images_page(skip, limit, tags, featured)
+    return {"images": images, "has_more": has_more}
 
 
 @router.get("/{image_id}", response_model=ImageResponse)
 async def get_image(
-        image_id: str,
+        request: Request,
+        response: Response,
+        image_id: ObjectId = Depends(parse_image_id),
         image_service: ImageService = Depends(get_image_service)
 ):
     """Get a single image by ID."""
-    logger.info(f"Getting image with ID {image_id}")
+    logger.info("Getting image with ID %s", image_id)
     image = await image_service.get_image(image_id)
+
+    # Image metadata only changes on update, so derive an ETag from the
+    # last modification time and let repeat clients skip the body entirely
+    version = (image.updated_at or image.created_at).timestamp()
+    etag = hashlib.blake2b(f"{image.id}:{version}".encode(), digest_size=8).hexdigest()
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED)
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "public, max-age=60"
     return image
 
 
@@ -46,7 +59,7 @@ async def create_image(
         image_service: ImageService = Depends(get_image_service)
 ):
     """Upload a new image."""
-    logger.info(f"Creating new image: {name}")
+    logger.info("Creating new image: %s", name)
 
     # Process form data
     tags_list = tags.split(",") if tags else []
@@ -62,10 +75,10 @@ async def create_image(
 
 @router.delete("/{image_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_image(
-        image_id: str,
+        image_id: ObjectId = Depends(parse_image_id),
         image_service: ImageService = Depends(get_image_service)
 ):
     """Delete an image."""
-    logger.info(f"Deleting image with ID {image_id}")
+    logger.info("Deleting image with ID %s", image_id)
     await image_service.delete_image(image_id)
     return None
\ No newline at end of file
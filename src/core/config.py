@@ -16,6 +16,8 @@ class Settings(BaseSettings):
     # MongoDB
     MONGODB_URL: str
     MONGODB_DB_NAME: str
+    MONGODB_MAX_POOL_SIZE: int = 100
+    MONGODB_MIN_POOL_SIZE: int = 10
 
     # Google Cloud Storage
     GCS_PROJECT_ID: str
@@ -12,6 +12,14 @@ class ImageNotFoundException(HTTPException):
         )
 
 
+class InvalidImageIdException(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid image ID"
+        )
+
+
 class StorageException(HTTPException):
     def __init__(self, detail: str):
         super().__init__(
@@ -22,7 +30,7 @@ class StorageException(HTTPException):
 
 async def exception_handler(request: Request, exc: Exception):
     """Global exception handler for the application."""
-    logger.error(f"Unhandled exception: {exc}", exc_info=True)
+    logger.error("Unhandled exception: %s", exc, exc_info=True)
     return JSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={"detail": "An unexpected error occurred"}
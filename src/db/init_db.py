@@ -1,3 +1,5 @@
+from pymongo import IndexModel
+
 from src.db.mongodb import get_database
 from src.core.logging import logger
 
@@ -6,29 +8,34 @@ async def init_db():
     """Initialize database with required collections and indexes."""
     db = get_database()
 
-    # Create collections if they don't exist
-    collections = await db.list_collection_names()
-
-    if "images" not in collections:
-        logger.info("Creating images collection")
-        await db.create_collection("images")
-
-    if "downloads" not in collections:
-        logger.info("Creating downloads collection")
-        await db.create_collection("downloads")
-
     # Create indexes
     logger.info("Setting up indexes")
 
-    # Images collection indexes
-    await db.images.create_index("name")
-    await db.images.create_index("tags")
-    await db.images.create_index("created_at")
-    await db.images.create_index("is_featured")
-
-    # Downloads collection indexes
-    await db.downloads.create_index("image_id")
-    await db.downloads.create_index("timestamp")
-    await db.downloads.create_index("ip_address")
-
-    logger.info("Database initialization completed")
\ No newline at end of file
+    # One createIndexes command per collection; create_indexes also creates
+    # the collection if it does not exist yet, so no separate
+    # list_collection_names/create_collection round-trips are needed
+
+    # Images collection indexes. The featured listing filters on
+    # is_featured and sorts by created_at desc, so it needs the compound
+    # index (equality field first, then sort field); the created_at
+    # singleton still serves the unfiltered listing sort.
+    await db.images.create_indexes([
+        IndexModel([("name", 1)]),
+        IndexModel([("tags", 1)]),
+        IndexModel([("created_at", 1)]),
+        IndexModel([("is_featured", 1), ("created_at", -1)]),
+        # Covers the download-count lookup (_id equality, downloads
+        # projected) so it never touches the document itself
+        IndexModel([("_id", 1), ("downloads", 1)]),
+    ])
+
+    # Downloads collection indexes. The compound index follows the
+    # equality-sort-range rule: it serves per-image time-range queries and
+    # also covers plain image_id equality lookups, so no standalone
+    # timestamp or image_id index is needed alongside it.
+    await db.downloads.create_indexes([
+        IndexModel([("image_id", 1), ("timestamp", -1)]),
+        IndexModel([("ip_address", 1)]),
+    ])
+
+    logger.info("Database initialization completed")
@@ -18,20 +18,34 @@ mongodb = MongoDB()
 
 async def connect_to_mongodb():
     """Connect to MongoDB."""
-    logger.info(f"Connecting to MongoDB at {settings.MONGODB_URL}...")
+    logger.info("Connecting to MongoDB at %s...", settings.MONGODB_URL)
     try:
-        mongodb.client = AsyncIOMotorClient(settings.MONGODB_URL)
+        mongodb.client = AsyncIOMotorClient(
+            settings.MONGODB_URL,
+            maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
+            # Keep a few connections warm so bursts after idle periods do
+            # not pay TLS/auth handshake latency.
+            minPoolSize=settings.MONGODB_MIN_POOL_SIZE,
+            # Cap concurrent connection establishment to avoid a
+            # thundering herd of handshakes when the pool refills.
+            maxConnecting=4,
+            waitQueueTimeoutMS=2500,
+            serverSelectionTimeoutMS=3000,
+            # Wire-protocol compression; plain is the implicit fallback if
+            # the server does not support zstd
+            compressors="zstd",
+        )
         logger.info("Client created, connecting to database...")
         mongodb.db = mongodb.client[settings.MONGODB_DB_NAME]
-        logger.info(f"Connected to database {settings.MONGODB_DB_NAME}, pinging...")
+        logger.info("Connected to database %s, pinging...", settings.MONGODB_DB_NAME)
         # Ping the database to verify connection --
         await mongodb.db.command("ping")
         logger.info("Connected to MongoDB successfully")
     except ConnectionFailure as e:
-        logger.error(f"MongoDB connection error: {e}")
+        logger.error("MongoDB connection error: %s", e)
         raise
     except Exception as e:
-        logger.error(f"Unexpected error connecting to MongoDB: {e}")
+        logger.error("Unexpected error connecting to MongoDB: %s", e)
         raise
 
 async def close_mongodb_connection():
@@ -1,11 +1,12 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 
-from pydantic import BaseModel, Field
-from bson import ObjectId
+from pydantic import BaseModel, ConfigDict, Field
 
 from src.models.image import PyObjectId
 
+UTC = timezone.utc
+
 
 class Download(BaseModel):
     id: Optional[PyObjectId] = Field(alias="_id")
@@ -14,11 +15,20 @@ class Download(BaseModel):
     user_agent: str
     referer: Optional[str] = None
     country_code: Optional[str] = None
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
-
-    class Config:
-        allow_population_by_field_name = True
-        arbitrary_types_allowed = True
-        json_encoders = {
-            ObjectId: str
-        }
\ No newline at end of file
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(UTC))
+
+    model_config = ConfigDict(
+        populate_by_name=True,
+        arbitrary_types_allowed=True,
+    )
+
+    @classmethod
+    def from_mongo(cls, doc) -> "Download":
+        """Build a Download from a trusted Mongo document, skipping validation.
+
+        Documents written by this app are already schema-shaped, so
+        model_construct avoids re-running every field validator per read.
+        """
+        data = dict(doc)
+        data["id"] = str(data.pop("_id"))
+        return cls.model_construct(**data)
\ No newline at end of file
@@ -1,15 +1,24 @@
-from datetime import datetime
+import re
+from datetime import datetime, timezone
 from typing import List, Optional, Annotated
 
-from pydantic import BaseModel, Field, BeforeValidator
+from pydantic import BaseModel, ConfigDict, Field, BeforeValidator
 from bson import ObjectId
 
+UTC = timezone.utc
+
+_OBJECT_ID_HEX = re.compile(r"[0-9a-fA-F]{24}").fullmatch
+
 
 # Modern Pydantic v2 approach
 def validate_object_id(v):
-    if not ObjectId.is_valid(v):
-        raise ValueError("Invalid ObjectId")
-    return str(v)
+    # Values from Mongo are ObjectId instances; values already validated
+    # upstream are 24-char hex strings. Handle both without re-parsing.
+    if isinstance(v, ObjectId):
+        return str(v)
+    if isinstance(v, str) and _OBJECT_ID_HEX(v):
+        return v
+    raise ValueError("Invalid ObjectId")
 
 
 PyObjectId = Annotated[str, BeforeValidator(validate_object_id)]
@@ -26,13 +35,22 @@ class Image(BaseModel):
     content_type: str  # MIME type
     downloads: int = 0
     tags: List[str] = []
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
     updated_at: Optional[datetime] = None
     is_featured: bool = False
 
-    class Config:
-        populate_by_name = True  # new in v2 (replaces allow_population_by_field_name)
-        arbitrary_types_allowed = True
-        json_encoders = {
-            ObjectId: str
-        }
\ No newline at end of file
+    model_config = ConfigDict(
+        populate_by_name=True,
+        arbitrary_types_allowed=True,
+    )
+
+    @classmethod
+    def from_mongo(cls, doc) -> "Image":
+        """Build an Image from a trusted Mongo document, skipping validation.
+
+        Documents written by this app are already schema-shaped, so
+        model_construct avoids re-running every field validator per read.
+        """
+        data = dict(doc)
+        data["id"] = str(data.pop("_id"))
+        return cls.model_construct(**data)
\ No newline at end of file
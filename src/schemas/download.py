@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class DownloadCreate(BaseModel):
@@ -16,8 +16,7 @@ class DownloadInDB(DownloadCreate):
     id: str
     timestamp: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class DownloadResponse(BaseModel):
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class ImageBase(BaseModel):
@@ -33,8 +33,7 @@ class ImageInDB(ImageBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ImageResponse(ImageInDB):
@@ -43,4 +42,4 @@ class ImageResponse(ImageInDB):
 
 class ImagesResponse(BaseModel):
     images: List[ImageResponse]
-    total: int
\ No newline at end of file
+    has_more: bool
\ No newline at end of file
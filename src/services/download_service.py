@@ -1,11 +1,109 @@
-from datetime import datetime
-from typing import Dict, Any
+import asyncio
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
 
 from bson import ObjectId
+from pymongo import ReturnDocument, WriteConcern
 
 from src.db.mongodb import get_database
 from src.models.download import Download
 from src.core.logging import logger
+from src.core.exceptions import ImageNotFoundException
+from src.utils.ttl_cache import TTLCache
+
+UTC = timezone.utc
+
+# Download counts change slowly but are polled frequently by dashboards, so
+# serve them from a short-lived in-process cache instead of hitting Mongo on
+# every request. Writes invalidate the cache to keep counts fresh.
+_count_cache = TTLCache(ttl=15)
+
+_TOTAL_CACHE_KEY = "total"
+
+# _id of the singleton stats document holding the running downloads total
+_TOTAL_STATS_ID = "downloads_total"
+
+# Counter updates are reconstructible analytics, not primary data, so skip
+# the per-operation journal sync; the event inserts keep the default
+# (journaled) write concern.
+_COUNTER_WRITE_CONCERN = WriteConcern(w=1, j=False)
+
+# Download events arriving within a short window are coalesced into a single
+# insert_many by a background writer task, so N concurrent downloads cost one
+# Mongo round-trip instead of N.
+_BATCH_MAX_SIZE = 200
+_BATCH_LINGER_SECONDS = 0.05
+
+_event_queue: Optional[asyncio.Queue] = None
+_writer_task: Optional[asyncio.Task] = None
+
+
+async def _flush_events(events: List[Dict[str, Any]]) -> None:
+    """Insert a batch of download events and bump the running total."""
+    db = get_database()
+    try:
+        await db.downloads.insert_many(events, ordered=False)
+        # One counter update per batch instead of per event
+        await db.stats.with_options(write_concern=_COUNTER_WRITE_CONCERN).update_one(
+            {"_id": _TOTAL_STATS_ID},
+            {"$inc": {"total": len(events)}},
+            upsert=True
+        )
+        _count_cache.pop(_TOTAL_CACHE_KEY)
+    except Exception as e:
+        logger.error("Error flushing %s download events: %s", len(events), e)
+
+
+async def _drain_event_queue() -> None:
+    """Collect queued download events into batches and insert them."""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await _event_queue.get()]
+        try:
+            deadline = loop.time() + _BATCH_LINGER_SECONDS
+            while len(batch) < _BATCH_MAX_SIZE:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(_event_queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+        except asyncio.CancelledError:
+            # Shutdown cancelled the task mid-linger; the events already
+            # pulled off the queue are only in this local batch, so flush
+            # them before exiting or they are lost.
+            await _flush_events(batch)
+            raise
+        await _flush_events(batch)
+
+
+def start_download_writer() -> None:
+    """Start the background task that batches download-event inserts."""
+    global _event_queue, _writer_task
+    _event_queue = asyncio.Queue()
+    _writer_task = asyncio.create_task(_drain_event_queue())
+    logger.info("Download event writer started")
+
+
+async def stop_download_writer() -> None:
+    """Stop the writer task, flushing any events still queued."""
+    global _event_queue, _writer_task
+    if _writer_task is not None:
+        _writer_task.cancel()
+        try:
+            await _writer_task
+        except asyncio.CancelledError:
+            pass
+        _writer_task = None
+    if _event_queue is not None:
+        remaining = []
+        while not _event_queue.empty():
+            remaining.append(_event_queue.get_nowait())
+        if remaining:
+            await _flush_events(remaining)
+        _event_queue = None
+    logger.info("Download event writer stopped")
 
 
 class DownloadService:
@@ -14,56 +112,101 @@ class DownloadService:
     def __init__(self):
         """Initialize the download service."""
         self.db = get_database()
+        # Bind collection handles once; Motor builds a new collection
+        # object on every db.<name> attribute access
+        self.images = self.db.images
+        self.downloads = self.db.downloads
+        self.stats = self.db.stats
+        # Handle for counter bumps that can skip the journal sync
+        self.images_unjournaled = self.images.with_options(
+            write_concern=_COUNTER_WRITE_CONCERN
+        )
 
-    async def record_download(self, image_id: str, request_info: Dict[str, Any]) -> Download:
+    async def start_download(self, image_id: ObjectId) -> str:
+        """Atomically bump an image's download counter and return its HD URL.
+
+        Fuses the existence check, the counter increment and the URL fetch
+        into a single indexed _id operation; raises ImageNotFoundException
+        for unknown ids.
+        """
+        image = await self.images_unjournaled.find_one_and_update(
+            {"_id": image_id},
+            {"$inc": {"downloads": 1}},
+            projection={"hd_url": 1},
+            return_document=ReturnDocument.AFTER
+        )
+        if image is None:
+            raise ImageNotFoundException()
+
+        # The per-image count has changed; drop the cached value.
+        _count_cache.pop(image_id)
+
+        return image["hd_url"]
+
+    async def record_download(self, image_id: ObjectId, request_info: Dict[str, Any]) -> Download:
         """Record a download event."""
         try:
-            # Increment image download counter
-            await self.db.images.update_one(
-                {"_id": ObjectId(image_id)},
-                {"$inc": {"downloads": 1}}
-            )
-
-            # Record download details
+            # Record download details; the id is generated client-side so
+            # the event can be handed to the batching writer without
+            # waiting for an insert acknowledgement.
             download_data = {
-                "image_id": image_id,
-                "ip_address": request_info.get("ip_address", "unknown"),
-                "user_agent": request_info.get("user_agent", "unknown"),
-                "referer": request_info.get("referer"),
-                "country_code": request_info.get("country_code"),
-                "timestamp": datetime.utcnow()
+                "_id": ObjectId(),
+                "image_id": str(image_id),
+                "ip_address": "unknown",
+                "user_agent": "unknown",
+                "referer": None,
+                "country_code": None,
+                **request_info,
+                "timestamp": datetime.now(UTC)
             }
 
-            result = await self.db.downloads.insert_one(download_data)
-            download_data["_id"] = result.inserted_id
+            # The writer batches the insert and the stats-total increment;
+            # the per-image counter is bumped by start_download, not here.
+            if _event_queue is not None:
+                _event_queue.put_nowait(download_data)
+            else:
+                # Writer not running (e.g. app started without the startup
+                # hook); flush the single event directly.
+                await _flush_events([download_data])
 
-            logger.info(f"Recorded download for image {image_id}")
+            logger.info("Recorded download for image %s", image_id)
 
-            return Download(**download_data)
+            return Download.from_mongo(download_data)
         except Exception as e:
-            logger.error(f"Error recording download: {e}")
+            logger.error("Error recording download: %s", e)
             raise
 
     async def get_total_downloads(self) -> int:
         """Get total downloads across all images."""
+        cached = _count_cache.get(_TOTAL_CACHE_KEY)
+        if cached is not None:
+            return cached
         try:
-            pipeline = [
-                {"$group": {"_id": None, "total": {"$sum": "$downloads"}}}
-            ]
-            result = await self.db.images.aggregate(pipeline).to_list(length=1)
-            return result[0]["total"] if result else 0
+            # record_download maintains a running total in the stats
+            # singleton, so the read is one indexed _id lookup.
+            doc = await self.stats.find_one({"_id": _TOTAL_STATS_ID})
+            total = doc["total"] if doc else 0
+            _count_cache.set(_TOTAL_CACHE_KEY, total)
+            return total
         except Exception as e:
-            logger.error(f"Error getting total downloads: {e}")
+            logger.error("Error getting total downloads: %s", e)
             raise
 
-    async def get_image_downloads(self, image_id: str) -> int:
+    async def get_image_downloads(self, image_id: ObjectId) -> int:
         """Get download count for a specific image."""
+        cached = _count_cache.get(image_id)
+        if cached is not None:
+            return cached
         try:
-            image = await self.db.images.find_one(
-                {"_id": ObjectId(image_id)},
-                {"downloads": 1}
+            # Excluding _id from the projection lets the (_id, downloads)
+            # index cover this query without fetching the document
+            image = await self.images.find_one(
+                {"_id": image_id},
+                {"_id": 0, "downloads": 1}
             )
-            return image["downloads"] if image else 0
+            total = image["downloads"] if image else 0
+            _count_cache.set(image_id, total)
+            return total
         except Exception as e:
-            logger.error(f"Error getting image downloads: {e}")
+            logger.error("Error getting image downloads: %s", e)
             raise
@@ -1,14 +1,24 @@
-from datetime import datetime
+import asyncio
+from datetime import datetime, timezone
 from typing import List, Optional, Dict, Any
 
 from bson import ObjectId
 from fastapi import UploadFile
+from pymongo import ReturnDocument
 
 from src.db.mongodb import get_database
 from src.models.image import Image
 from src.services.storage_service import StorageService
 from src.core.logging import logger
 from src.core.exceptions import ImageNotFoundException
+from src.utils.ttl_cache import TTLCache
+
+UTC = timezone.utc
+
+# The catalog rarely changes but individual images are looked up on every
+# download, so keep recently fetched images in memory for a short while.
+# Mutating operations pop the affected key.
+_image_cache = TTLCache(ttl=60)
 
 
 class ImageService:
@@ -17,6 +27,9 @@ class ImageService:
     def __init__(self):
         """Initialize the image service."""
         self.db = get_database()
+        # Bind the collection handle once; Motor builds a new collection
+        # object on every db.<name> attribute access
+        self.images = self.db.images
         self.storage_service = StorageService()
 
     async def get_images(
@@ -34,12 +47,33 @@ class ImageService:
         if is_featured is not None:
             query["is_featured"] = is_featured
 
-        # Execute query
-        cursor = self.db.images.find(query).skip(skip).limit(limit).sort("created_at", -1)
-        images = await cursor.to_list(length=limit)
+        # Execute query, building models while the cursor streams instead
+        # of materializing an intermediate list of dicts
+        cursor = self.images.find(query).skip(skip).limit(limit).sort("created_at", -1)
+        return [Image.from_mongo(doc) async for doc in cursor]
 
-        # Convert to Image model
-        return [Image(**doc) for doc in images]
+    async def get_images_page(
+            self,
+            skip: int = 0,
+            limit: int = 20,
+            tags: Optional[List[str]] = None,
+            is_featured: Optional[bool] = None
+    ):
+        """Get a page of images plus whether more pages remain."""
+        # Build query
+        query = {}
+        if tags:
+            query["tags"] = {"$all": tags}
+        if is_featured is not None:
+            query["is_featured"] = is_featured
+
+        # Probe one document past the page: its presence answers "is there
+        # another page" without counting the whole filtered set
+        cursor = self.images.find(query).skip(skip).limit(limit + 1).sort("created_at", -1)
+        images = [Image.from_mongo(doc) async for doc in cursor]
+
+        has_more = len(images) > limit
+        return images[:limit], has_more
 
     async def count_images(
             self,
@@ -54,32 +88,42 @@ class ImageService:
         if is_featured is not None:
             query["is_featured"] = is_featured
 
-        # Execute count
-        return await self.db.images.count_documents(query)
+        # Execute count; unfiltered counts read collection metadata in O(1)
+        if not query:
+            return await self.images.estimated_document_count()
+        return await self.images.count_documents(query)
 
-    async def get_image(self, image_id: str) -> Image:
+    async def get_image(self, image_id: ObjectId) -> Image:
         """Get a single image by ID."""
+        cached = _image_cache.get(image_id)
+        if cached is not None:
+            return cached
         try:
-            doc = await self.db.images.find_one({"_id": ObjectId(image_id)})
+            doc = await self.images.find_one({"_id": image_id})
             if not doc:
                 raise ImageNotFoundException()
-            return Image(**doc)
+            image = Image.from_mongo(doc)
+            _image_cache.set(image_id, image)
+            return image
         except Exception as e:
-            logger.error(f"Error getting image {image_id}: {e}")
+            logger.error("Error getting image %s: %s", image_id, e)
             raise ImageNotFoundException()
 
     async def create_image(self, file: UploadFile, image_data: Dict[str, Any]) -> Image:
         """Create a new image."""
         try:
-            # Upload to storage
-            storage_data = await self.storage_service.upload_image(file)
-
-            # Generate thumbnail
-            content = await file.seek(0)
+            # Read the upload once; thumbnail generation needs the full
+            # bytes anyway, so share them with the storage upload instead
+            # of re-reading the spooled file afterwards
             content = await file.read()
-            thumbnail_url = await self.storage_service.generate_thumbnail(
-                storage_data["filename"],
-                content
+
+            # The destination name only depends on the original filename,
+            # so derive it up front and run the original upload and the
+            # thumbnail generation concurrently
+            filename = self.storage_service.make_filename(file.filename)
+            storage_data, thumbnail_url = await asyncio.gather(
+                self.storage_service.upload_image(file, filename=filename, content=content),
+                self.storage_service.generate_thumbnail(filename, content)
             )
 
             # Prepare image data
@@ -93,62 +137,67 @@ class ImageService:
                 "content_type": storage_data["content_type"],
                 "tags": image_data.get("tags", []),
                 "downloads": 0,
-                "created_at": datetime.utcnow(),
+                "created_at": datetime.now(UTC),
                 "is_featured": image_data.get("is_featured", False)
             }
 
             # Insert into database
-            result = await self.db.images.insert_one(new_image)
+            result = await self.images.insert_one(new_image)
             new_image["_id"] = result.inserted_id
 
-            logger.info(f"Created new image with ID {result.inserted_id}")
+            logger.info("Created new image with ID %s", result.inserted_id)
 
-            return Image(**new_image)
+            return Image.from_mongo(new_image)
         except Exception as e:
-            logger.error(f"Error creating image: {e}")
+            logger.error("Error creating image: %s", e)
             raise
 
-    async def update_image(self, image_id: str, image_data: Dict[str, Any]) -> Image:
+    async def update_image(self, image_id: ObjectId, image_data: Dict[str, Any]) -> Image:
         """Update an existing image."""
         try:
-            # Check if image exists
-            image = await self.get_image(image_id)
-
             # Prepare update data
             update_data = {
-                "updated_at": datetime.utcnow(),
+                "updated_at": datetime.now(UTC),
                 **{k: v for k, v in image_data.items() if v is not None}
             }
 
-            # Update in database
-            await self.db.images.update_one(
-                {"_id": ObjectId(image_id)},
-                {"$set": update_data}
+            # Existence check, update and refetch in one round-trip
+            doc = await self.images.find_one_and_update(
+                {"_id": image_id},
+                {"$set": update_data},
+                return_document=ReturnDocument.AFTER
             )
+            if not doc:
+                raise ImageNotFoundException()
+
+            logger.info("Updated image %s", image_id)
 
-            logger.info(f"Updated image {image_id}")
+            # Refresh the cache with the updated document
+            image = Image.from_mongo(doc)
+            _image_cache.set(image_id, image)
 
-            # Return updated image
-            return await self.get_image(image_id)
+            return image
         except Exception as e:
-            logger.error(f"Error updating image {image_id}: {e}")
+            logger.error("Error updating image %s: %s", image_id, e)
             raise
 
-    async def delete_image(self, image_id: str) -> bool:
+    async def delete_image(self, image_id: ObjectId) -> bool:
         """Delete an image."""
         try:
-            # Check if image exists
-            image = await self.get_image(image_id)
+            # Existence check and delete in one atomic round-trip; the
+            # returned document supplies the filename for storage cleanup
+            doc = await self.images.find_one_and_delete({"_id": image_id})
+            if not doc:
+                raise ImageNotFoundException()
 
-            # Delete from storage
-            await self.storage_service.delete_image(image.filename)
+            _image_cache.pop(image_id)
 
-            # Delete from database
-            result = await self.db.images.delete_one({"_id": ObjectId(image_id)})
+            # Delete from storage
+            await self.storage_service.delete_image(doc["filename"])
 
-            logger.info(f"Deleted image {image_id}")
+            logger.info("Deleted image %s", image_id)
 
-            return result.deleted_count > 0
+            return True
         except Exception as e:
-            logger.error(f"Error deleting image {image_id}: {e}")
+            logger.error("Error deleting image %s: %s", image_id, e)
             raise
\ No newline at end of file
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import uuid
 import json
@@ -41,32 +42,58 @@ class StorageService:
 
             logger.info("Google Cloud Storage client initialized with JSON credentials")
         except Exception as e:
-            logger.error(f"Failed to initialize storage client: {e}")
+            logger.error("Failed to initialize storage client: %s", e)
             raise StorageException(str(e))
 
-    async def upload_image(self, file: UploadFile, filename: Optional[str] = None) -> Dict[str, Any]:
-        """Upload an image to Google Cloud Storage."""
+    @staticmethod
+    def make_filename(original_filename: str) -> str:
+        """Generate a unique storage filename preserving the extension."""
+        ext = os.path.splitext(original_filename)[1]
+        return f"{uuid.uuid4()}{ext}"
+
+    async def upload_image(
+            self,
+            file: UploadFile,
+            filename: Optional[str] = None,
+            content: Optional[bytes] = None
+    ) -> Dict[str, Any]:
+        """Upload an image to Google Cloud Storage.
+
+        When the caller has already read the payload (e.g. because it also
+        needs the bytes for thumbnail generation), pass it as ``content``
+        so the spooled upload is not read twice.
+        """
         try:
             # Generate unique filename if not provided
             if not filename:
-                ext = os.path.splitext(file.filename)[1]
-                filename = f"{uuid.uuid4()}{ext}"
+                filename = self.make_filename(file.filename)
 
-            # Read file content
-            content = await file.read()
-            file_size = len(content)
-
-            # Upload to GCS
+            # The GCS client is synchronous, so run it in a worker thread
+            # to keep the event loop responsive
             blob = self.original_bucket.blob(filename)
-            blob.upload_from_string(
-                content,
-                content_type=file.content_type
-            )
+            if content is not None:
+                file_size = len(content)
+                await asyncio.to_thread(
+                    blob.upload_from_string,
+                    content,
+                    content_type=file.content_type
+                )
+            else:
+                # Measure the upload from the spooled temp file instead of
+                # reading the whole payload into memory, then stream it
+                file.file.seek(0, os.SEEK_END)
+                file_size = file.file.tell()
+                file.file.seek(0)
+                await asyncio.to_thread(
+                    blob.upload_from_file,
+                    file.file,
+                    content_type=file.content_type
+                )
 
             # Generate public URL
             hd_url = f"https://storage.googleapis.com/{settings.GCS_ORIGINAL_BUCKET}/{filename}"
 
-            logger.info(f"Uploaded image {filename} to storage")
+            logger.info("Uploaded image %s to storage", filename)
 
             return {
                 "filename": filename,
@@ -75,52 +102,76 @@ class StorageService:
                 "file_size": file_size
             }
         except Exception as e:
-            logger.error(f"Failed to upload image: {e}")
+            logger.error("Failed to upload image: %s", e)
             raise StorageException(str(e))
 
+    @staticmethod
+    def _build_thumbnail(content: bytes):
+        """Decode and downscale an image (CPU-bound, runs in a thread)."""
+        image = Image.open(BytesIO(content))
+        image_format = image.format or "JPEG"
+
+        # Already at or below the target size: reuse the original bytes
+        # instead of paying a decode + re-encode pass. Browsers honor the
+        # original EXIF orientation, so no transpose is needed here.
+        if image.width <= 1000 and image.height <= 1000:
+            return content, image_format
+
+        # For JPEGs, let libjpeg decode at reduced scale — far cheaper
+        # than a full decode followed by resampling
+        image.draft("RGB", (2000, 2000))
+
+        # Preserve EXIF orientation
+        if hasattr(image, '_getexif') and image._getexif() is not None:
+            from PIL import ImageOps
+            image = ImageOps.exif_transpose(image)
+
+        # Use larger thumbnail size (1000x1000)
+        image.thumbnail((1000, 1000))
+
+        # JPEG cannot encode palette/alpha modes directly
+        if image_format == "JPEG" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+
+        # Save thumbnail to memory, preserving any EXIF data
+        thumbnail_io = BytesIO()
+        exif = image.info.get('exif')
+        save_kwargs = {"exif": exif} if exif else {}
+        image.save(thumbnail_io, format=image_format, **save_kwargs)
+
+        return thumbnail_io.getvalue(), image_format
+
     async def generate_thumbnail(self, filename: str, content: bytes = None) -> str:
         """Generate a thumbnail for an image and upload it to storage."""
         try:
             # If content not provided, download from storage
             if not content:
                 blob = self.original_bucket.blob(filename)
-                content = blob.download_as_bytes()
-
-            # Generate thumbnail using PIL
-            image = Image.open(BytesIO(content))
-
-            # Preserve EXIF orientation
-            if hasattr(image, '_getexif') and image._getexif() is not None:
-                from PIL import ImageOps
-                image = ImageOps.exif_transpose(image)
+                content = await asyncio.to_thread(blob.download_as_bytes)
 
-            # Use larger thumbnail size (1000x1000)
-            image.thumbnail((1000, 1000))
-
-            # Save thumbnail to memory
-            thumbnail_io = BytesIO()
-            image_format = image.format or "JPEG"
-
-            # Preserve any EXIF data when saving
-            image.save(thumbnail_io, format=image_format, exif=getattr(image, 'info', {}).get('exif'))
-            thumbnail_io.seek(0)
+            # Decode/resize/encode off the event loop; the PIL calls are
+            # CPU-bound and would stall every other coroutine
+            thumbnail_bytes, image_format = await asyncio.to_thread(
+                self._build_thumbnail, content
+            )
 
             # Upload thumbnail to storage
             thumbnail_filename = f"thumb_{filename}"
             thumbnail_blob = self.thumbnail_bucket.blob(thumbnail_filename)
-            thumbnail_blob.upload_from_file(
-                thumbnail_io,
+            await asyncio.to_thread(
+                thumbnail_blob.upload_from_string,
+                thumbnail_bytes,
                 content_type=f"image/{image_format.lower()}"
             )
 
             # Generate thumbnail URL
             thumbnail_url = f"https://storage.googleapis.com/{settings.GCS_THUMBNAIL_BUCKET}/{thumbnail_filename}"
 
-            logger.info(f"Generated thumbnail for {filename}")
+            logger.info("Generated thumbnail for %s", filename)
 
             return thumbnail_url
         except Exception as e:
-            logger.error(f"Failed to generate thumbnail: {e}")
+            logger.error("Failed to generate thumbnail: %s", e)
             raise StorageException(str(e))
     async def delete_image(self, filename: str) -> bool:
         """Delete an image and its thumbnail from storage."""
@@ -136,9 +187,9 @@ class StorageService:
             if thumbnail_blob.exists():
                 thumbnail_blob.delete()
 
-            logger.info(f"Deleted image {filename} from storage")
+            logger.info("Deleted image %s from storage", filename)
 
             return True
         except Exception as e:
-            logger.error(f"Failed to delete image: {e}")
+            logger.error("Failed to delete image: %s", e)
             raise StorageException(str(e))
\ No newline at end of file
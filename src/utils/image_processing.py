@@ -30,6 +30,11 @@ def resize_image(
     width, height = image.size
     ratio = min(max_size[0] / width, max_size[1] / height)
 
+    # Already small enough and staying in the same format: skip the
+    # re-encode entirely and forward the original bytes
+    if ratio >= 1 and format == image.format:
+        return BytesIO(image_bytes)
+
     # Only resize if image is larger than max_size
     if ratio < 1:
         new_width = int(width * ratio)
@@ -63,9 +68,16 @@ def generate_thumbnail(
     # Open image from bytes
     image = PILImage.open(BytesIO(image_bytes))
 
+    # Let libjpeg decode JPEGs at reduced scale before resampling
+    image.draft("RGB", (size[0] * 2, size[1] * 2))
+
     # Create thumbnail (maintains aspect ratio)
     image.thumbnail(size)
 
+    # JPEG cannot encode palette/alpha modes directly
+    if format == "JPEG" and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+
     # Save to BytesIO
     output = BytesIO()
     image.save(output, format=format)
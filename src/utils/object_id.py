@@ -1,6 +1,10 @@
+import re
+
 from bson import ObjectId
 from bson.errors import InvalidId
 
+_OID_RE = re.compile(r"[0-9a-fA-F]{24}").fullmatch
+
 
 def is_valid_object_id(id_str: str) -> bool:
     """
@@ -12,8 +16,13 @@ def is_valid_object_id(id_str: str) -> bool:
     Returns:
         True if valid, False otherwise
     """
+    # Reject obvious garbage with a cheap hex check before paying for
+    # ObjectId construction; raising/catching InvalidId is far slower
+    # than a precompiled fullmatch for the common invalid case.
+    if not isinstance(id_str, str) or _OID_RE(id_str) is None:
+        return False
     try:
         ObjectId(id_str)
         return True
     except (InvalidId, TypeError):
-        return False
\ No newline at end of file
+        return False